@@ -2,14 +2,19 @@
 from __future__ import annotations
 
 import argparse
+import base64
+import bisect
+import heapq
+import secrets
 import sys
-import uuid
+import time
 import json
 import os
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 # ---------------------------
@@ -43,7 +48,22 @@ class Flight:
     departure_time: str  # "YYYYMMDD HH:MM:SS"
     arrival_time: str    # "YYYYMMDD HH:MM:SS"
     departure_date: str  # "YYYY-MM-DD"
-    seat_map: Dict[str, SeatStatus] = field(default_factory=dict)
+    # one status byte per seat, indexed by (row-1)*6 + col
+    seat_status: bytearray = field(default_factory=bytearray)
+    # min-heap of AVAILABLE seat indices; may hold stale entries (see pop_free_seats)
+    free_heap: List[int] = field(default_factory=list, repr=False, compare=False)
+    # normalized copies for search_flights (not persisted)
+    _departure_city_lc: str = field(init=False, repr=False, compare=False)
+    _arrival_city_lc: str = field(init=False, repr=False, compare=False)
+    departure_epoch: int = field(init=False, repr=False, compare=False)  # UTC seconds, sort key
+
+    def __post_init__(self) -> None:
+        if not self.free_heap:
+            self.free_heap = build_free_heap(self.seat_status)
+        self._departure_city_lc = self.departure_city.strip().lower()
+        self._arrival_city_lc = self.arrival_city.strip().lower()
+        dep_dt = datetime.strptime(self.departure_time, "%Y%m%d %H:%M:%S")
+        self.departure_epoch = int(dep_dt.replace(tzinfo=timezone.utc).timestamp())
 
 
 @dataclass
@@ -54,6 +74,7 @@ class Hold:
     customer: str
     time_expires: datetime
     hold_status: HoldStatus
+    seat_idx: List[int] = field(default_factory=list)  # indices into seat_status
 
 
 @dataclass
@@ -64,17 +85,61 @@ class Purchase:
     customer: str
     time_purchased: datetime
     purchased_status: PurchaseStatus
+    seat_idx: List[int] = field(default_factory=list)  # indices into seat_status
 
 
 # ---------------------------
 # In-memory Store (swap later)
 # ---------------------------
 
+class IdGen:
+    """
+    Hold/purchase ids: 6 hex digits of sequence + 4 random hex digits,
+    e.g. H-00002a9f3c. Sequences start after the records already loaded.
+    """
+
+    def __init__(self, hold_seq: int = 0, purchase_seq: int = 0) -> None:
+        self._h = hold_seq
+        self._p = purchase_seq
+
+    def hold_id(self) -> str:
+        self._h += 1
+        return f"H-{self._h:06x}{secrets.token_hex(2)}"
+
+    def purchase_id(self) -> str:
+        self._p += 1
+        return f"P-{self._p:06x}{secrets.token_hex(2)}"
+
+
 class InMemoryStore:
     def __init__(self) -> None:
         self.flights: Dict[str, Flight] = {}
         self.holds: Dict[str, Hold] = {}
         self.purchases: Dict[str, Purchase] = {}
+        # min-heap of (time_expires, hold_id) for holds that may still be ACTIVE
+        self.active_hold_heap: List[Tuple[datetime, str]] = []
+        # "YYYY-MM-DD" -> flights departing that day; these lists and
+        # flights_by_dep are all kept ordered by departure_epoch
+        self.by_departure_date: Dict[str, List[Flight]] = {}
+        self.flights_by_dep: List[Flight] = []
+        self.ids = IdGen()
+
+    def add_flight(self, flight: Flight) -> None:
+        by_dep = attrgetter("departure_epoch")
+        self.flights[flight.id] = flight
+        bisect.insort(self.by_departure_date.setdefault(flight.departure_date, []), flight, key=by_dep)
+        bisect.insort(self.flights_by_dep, flight, key=by_dep)
+
+    def load_flights(self, flights: Iterable[Flight]) -> None:
+        """Bulk add_flight(): append everything, then sort each index once."""
+        by_dep = attrgetter("departure_epoch")
+        for flight in flights:
+            self.flights[flight.id] = flight
+            self.by_departure_date.setdefault(flight.departure_date, []).append(flight)
+            self.flights_by_dep.append(flight)
+        for same_day in self.by_departure_date.values():
+            same_day.sort(key=by_dep)
+        self.flights_by_dep.sort(key=by_dep)
 
     def seed_flights(self) -> None:
         """
@@ -96,9 +161,9 @@ class InMemoryStore:
             departure_time=dep_dt.strftime("%Y%m%d %H:%M:%S"),
             arrival_time=arr_dt.strftime("%Y%m%d %H:%M:%S"),
             departure_date="2025-03-01",
-            seat_map=build_seat_map(rows=24, seats_per_row=6),
+            seat_status=build_seat_map(rows=24, seats_per_row=6),
         )
-        self.flights[flight.id] = flight
+        self.add_flight(flight)
 
 
 # ---------------------------
@@ -106,16 +171,56 @@ class InMemoryStore:
 # ---------------------------
 
 SEAT_LETTERS_6 = ["A", "B", "C", "D", "E", "F"]
+SEATS_PER_ROW = 6
+
+# Status codes stored in Flight.seat_status
+SEAT_AVAILABLE = 0
+SEAT_HOLD = 1
+SEAT_PURCHASED = 2
+
+_SEAT_STATUS_BY_CODE = (SeatStatus.AVAILABLE, SeatStatus.HOLD, SeatStatus.PURCHASED)
+_SEAT_CODE_BY_STATUS = {st: code for code, st in enumerate(_SEAT_STATUS_BY_CODE)}
 
+# status byte -> grid symbol, for bytes.translate()
+_SEAT_SYMBOLS = bytes.maketrans(b"\x00\x01\x02", b"OHX")
 
-def build_seat_map(rows: int, seats_per_row: int) -> Dict[str, SeatStatus]:
-    if seats_per_row != 6:
+
+def build_seat_map(rows: int, seats_per_row: int) -> bytearray:
+    if seats_per_row != SEATS_PER_ROW:
         raise ValueError("This starter assumes 6 seats/row (A-F).")
-    seat_map: Dict[str, SeatStatus] = {}
-    for r in range(1, rows + 1):
-        for letter in SEAT_LETTERS_6:
-            seat_map[f"{r}{letter}"] = SeatStatus.AVAILABLE
-    return seat_map
+    return bytearray(rows * SEATS_PER_ROW)  # all SEAT_AVAILABLE
+
+
+def build_free_heap(seat_status: bytearray) -> List[int]:
+    # ascending indices already satisfy the heap invariant
+    if not any(seat_status):
+        # freshly built plane: every seat is SEAT_AVAILABLE
+        return list(range(len(seat_status)))
+    return [i for i, st in enumerate(seat_status) if st == SEAT_AVAILABLE]
+
+
+def release_seat(flight: Flight, idx: int) -> None:
+    flight.seat_status[idx] = SEAT_AVAILABLE
+    heapq.heappush(flight.free_heap, idx)
+    if len(flight.free_heap) > 2 * len(flight.seat_status):
+        # too many stale entries; compact
+        flight.free_heap = build_free_heap(flight.seat_status)
+
+
+def pop_free_seats(flight: Flight, count: int) -> List[int]:
+    """
+    Pop the `count` lowest AVAILABLE seat indices off flight.free_heap.
+    Entries for seats taken by explicit --seats holds are left in the heap
+    and skipped here. Caller must ensure at least `count` seats are AVAILABLE.
+    """
+    buf = flight.seat_status
+    heap = flight.free_heap
+    taken: List[int] = []
+    while len(taken) < count:
+        i = heapq.heappop(heap)
+        if buf[i] == SEAT_AVAILABLE and (not taken or taken[-1] != i):
+            taken.append(i)
+    return taken
 
 
 def normalize_seat(seat: str) -> str:
@@ -125,44 +230,52 @@ def normalize_seat(seat: str) -> str:
     return s
 
 
-def seat_sort_key(seat: str) -> Tuple[int, str]:
-    # "14A" -> (14, "A")
-    num = ""
-    letter = ""
-    for ch in seat:
-        if ch.isdigit():
-            num += ch
-        else:
-            letter += ch
-    return (int(num), letter)
+def seat_to_idx(seat: str) -> int:
+    # "12A" -> (12-1)*6 + 0; only canonical labels ("012A", "0A" are rejected)
+    row_part, letter = seat[:-1], seat[-1:]
+    if (
+        letter not in SEAT_LETTERS_6
+        or not (row_part.isascii() and row_part.isdigit())
+        or row_part[0] == "0"
+    ):
+        raise ValueError(f"Invalid seat: {seat}")
+    return (int(row_part) - 1) * SEATS_PER_ROW + (ord(letter) - 65)
 
 
-def infer_rows_from_seat_map(seat_map: Dict[str, SeatStatus], default_rows: int = 24) -> int:
+def idx_to_seat(idx: int) -> str:
+    row, col = divmod(idx, SEATS_PER_ROW)
+    return f"{row + 1}{SEAT_LETTERS_6[col]}"
+
+
+def get_seat_status(flight: Flight, seat: str) -> SeatStatus:
+    idx = seat_to_idx(normalize_seat(seat))
+    if idx >= len(flight.seat_status):
+        raise ValueError(f"Invalid seat for this plane: {seat}")
+    return _SEAT_STATUS_BY_CODE[flight.seat_status[idx]]
+
+
+def infer_rows_from_seat_map(seat_map: Dict[str, str], default_rows: int = 24) -> int:
     max_row = 0
     for seat in seat_map.keys():
-        digits = ""
-        for ch in seat:
-            if ch.isdigit():
-                digits += ch
-            else:
-                break
-        if digits:
-            max_row = max(max_row, int(digits))
+        try:
+            max_row = max(max_row, int(seat[:-1]))
+        except ValueError:
+            continue
     return max_row if max_row > 0 else default_rows
 
 
-def format_seat_grid(seat_map: Dict[str, SeatStatus], rows: int = 24) -> str:
+def format_seat_grid(seat_status: bytearray) -> str:
     # Simple ASCII grid: A B C  D E F with aisle gap
     out: List[str] = []
     out.append("Row  A   B   C     D   E   F")
     out.append("--------------------------------")
+    # one C-level pass maps every status byte to its symbol byte
+    syms = seat_status.translate(_SEAT_SYMBOLS)
+    rows = len(seat_status) // SEATS_PER_ROW
     for r in range(1, rows + 1):
-        row_seats = [f"{r}{l}" for l in SEAT_LETTERS_6]
-        statuses = [seat_map[s] for s in row_seats]
-        def sym(st: SeatStatus) -> str:
-            return {"AVAILABLE": "O", "HOLD": "H", "PURCHASED": "X"}[st.value]
-        a, b, c, d, e, f = [sym(st) for st in statuses]
-        out.append(f"{r:>3}  {a}   {b}   {c}     {d}   {e}   {f}")
+        start = (r - 1) * SEATS_PER_ROW
+        a, b, c, d, e, f = syms[start:start + SEATS_PER_ROW]
+        out.append(f"{r:>3}  {a:c}   {b:c}   {c:c}     {d:c}   {e:c}   {f:c}")
     out.append("")
     out.append("Legend: O=AVAILABLE, H=HOLD, X=PURCHASED")
     return "\n".join(out)
@@ -173,9 +286,13 @@ def format_seat_grid(seat_map: Dict[str, SeatStatus], rows: int = 24) -> str:
 # ---------------------------
 
 class AirlineService:
+    # operations within this window of the last sweep reuse its result
+    SWEEP_INTERVAL_NS = 1_000_000_000
+
     def __init__(self, store: InMemoryStore, hold_minutes_default: int = 10) -> None:
         self.store = store
         self.hold_minutes_default = hold_minutes_default
+        self._last_sweep_ns: Optional[int] = None
 
     def _now(self) -> datetime:
         return datetime.now(timezone.utc)
@@ -184,31 +301,38 @@ class AirlineService:
         """Expire holds past time_expires and free seats."""
         now = self._now()
         expired_count = 0
+        heap = self.store.active_hold_heap
 
-        for hold in list(self.store.holds.values()):
-            if hold.hold_status != HoldStatus.ACTIVE:
+        while heap and heap[0][0] <= now:
+            _, hold_id = heapq.heappop(heap)
+            hold = self.store.holds.get(hold_id)
+            # entries for holds already purchased are stale; drop them
+            if hold is None or hold.hold_status != HoldStatus.ACTIVE:
                 continue
-            if hold.time_expires <= now:
-                # expire + free seats
-                flight = self._get_flight(hold.flight_id)
-                for seat in hold.seats:
-                    # Only free if still HOLD (defensive)
-                    if flight.seat_map.get(seat) == SeatStatus.HOLD:
-                        flight.seat_map[seat] = SeatStatus.AVAILABLE
-                hold.hold_status = HoldStatus.EXPIRED
-                expired_count += 1
+            # expire + free seats
+            flight = self._get_flight(hold.flight_id)
+            for i in hold.seat_idx:
+                # Only free if still HOLD (defensive)
+                if flight.seat_status[i] == SEAT_HOLD:
+                    release_seat(flight, i)
+            hold.hold_status = HoldStatus.EXPIRED
+            expired_count += 1
 
         return expired_count
 
+    def _maybe_sweep(self) -> None:
+        now_ns = time.monotonic_ns()
+        if self._last_sweep_ns is None or now_ns - self._last_sweep_ns > self.SWEEP_INTERVAL_NS:
+            self.sweep_expired_holds()
+            self._last_sweep_ns = now_ns
+
     def _get_flight(self, flight_id: str) -> Flight:
         if flight_id not in self.store.flights:
             raise ValueError(f"Unknown flight_id: {flight_id}")
         return self.store.flights[flight_id]
 
     def list_flights(self) -> List[Flight]:
-        flights = list(self.store.flights.values())
-        flights.sort(key=lambda x: x.departure_time)
-        return flights
+        return list(self.store.flights_by_dep)
 
     def add_flight(
         self,
@@ -252,9 +376,9 @@ class AirlineService:
             departure_time=departure_dt.strftime("%Y%m%d %H:%M:%S"),
             arrival_time=arrival_dt.strftime("%Y%m%d %H:%M:%S"),
             departure_date=departure_dt.strftime("%Y-%m-%d"),
-            seat_map=build_seat_map(rows=rows, seats_per_row=6),
+            seat_status=build_seat_map(rows=rows, seats_per_row=6),
         )
-        self.store.flights[flight.id] = flight
+        self.store.add_flight(flight)
         return flight
 
     # --- Operations requested ---
@@ -267,36 +391,40 @@ class AirlineService:
     arrival_time_substr: Optional[str] = None,
     departure_date: Optional[str] = None,   # <-- add
     ) -> List[Flight]:
-        self.sweep_expired_holds()
-
-        def norm(s: str) -> str:
-            return s.strip().lower()
+        self._maybe_sweep()
+
+        dep_city = departing_city.strip().lower() if departing_city else None
+        arr_city = arriving_city.strip().lower() if arriving_city else None
+        dep_time = departure_time_substr.strip() if departure_time_substr else None
+        arr_time = arrival_time_substr.strip() if arrival_time_substr else None
+
+        # both candidate lists are already ordered by departure_epoch
+        candidates: List[Flight]
+        if departure_date:
+            # exact match on "YYYY-MM-DD"
+            candidates = self.store.by_departure_date.get(departure_date.strip(), [])
+        else:
+            candidates = self.store.flights_by_dep
 
         results: List[Flight] = []
-        for f in self.store.flights.values():
-            ok = True
-            if departing_city:
-                ok = ok and norm(departing_city) in norm(f.departure_city)
-            if arriving_city:
-                ok = ok and norm(arriving_city) in norm(f.arrival_city)
-            if departure_time_substr:
-                ok = ok and departure_time_substr.strip() in f.departure_time
-            if arrival_time_substr:
-                ok = ok and arrival_time_substr.strip() in f.arrival_time
-            if departure_date:
-                # exact match on "YYYY-MM-DD"
-                ok = ok and f.departure_date == departure_date.strip()
-            if ok:
-                results.append(f)
-
-        results.sort(key=lambda x: x.departure_time)
+        for f in candidates:
+            if dep_city and dep_city not in f._departure_city_lc:
+                continue
+            if arr_city and arr_city not in f._arrival_city_lc:
+                continue
+            if dep_time and dep_time not in f.departure_time:
+                continue
+            if arr_time and arr_time not in f.arrival_time:
+                continue
+            results.append(f)
+
         return results
 
 
-    def view_available_seats(self, flight_id: str) -> Dict[str, SeatStatus]:
-        self.sweep_expired_holds()
+    def view_available_seats(self, flight_id: str) -> bytearray:
+        self._maybe_sweep()
         flight = self._get_flight(flight_id)
-        return flight.seat_map
+        return flight.seat_status
 
     def reserve_seats(
         self,
@@ -308,10 +436,11 @@ class AirlineService:
     ) -> Hold:
         """
         Reserve specific seats OR reserve 'count' seats automatically.
-        Creates a HOLD record and flips seat_map status to HOLD.
+        Creates a HOLD record and flips seat_status to HOLD.
         """
-        self.sweep_expired_holds()
+        self._maybe_sweep()
         flight = self._get_flight(flight_id)
+        buf = flight.seat_status
 
         if seats and count:
             raise ValueError("Use either --seats or --count, not both.")
@@ -321,32 +450,41 @@ class AirlineService:
             raise ValueError("--count must be > 0.")
 
         requested: List[str]
+        requested_idx: List[int]
         if seats:
             requested = [normalize_seat(s) for s in seats]
+            requested_idx = []
+            for seat in requested:
+                try:
+                    requested_idx.append(seat_to_idx(seat))
+                except ValueError:
+                    requested_idx.append(-1)  # rejected below
         else:
             # auto-assign first N available seats (front-to-back, A-F)
-            available = [s for s, st in flight.seat_map.items() if st == SeatStatus.AVAILABLE]
-            available.sort(key=seat_sort_key)
             if count is None:
                 raise ValueError("count missing (unexpected).")
-            if len(available) < count:
-                raise ValueError(f"Not enough available seats. Requested={count}, available={len(available)}")
-            requested = available[:count]
+            available = buf.count(SEAT_AVAILABLE)
+            if available < count:
+                raise ValueError(f"Not enough available seats. Requested={count}, available={available}")
+            requested_idx = pop_free_seats(flight, count)
+            requested = [idx_to_seat(i) for i in requested_idx]
 
         # validate seats exist + available
-        for seat in requested:
-            if seat not in flight.seat_map:
+        for seat, i in zip(requested, requested_idx):
+            if not 0 <= i < len(buf):
                 raise ValueError(f"Invalid seat for this plane: {seat}")
-            if flight.seat_map[seat] != SeatStatus.AVAILABLE:
-                raise ValueError(f"Seat not available: {seat} (status={flight.seat_map[seat].value})")
+            if buf[i] != SEAT_AVAILABLE:
+                raise ValueError(f"Seat not available: {seat} (status={_SEAT_STATUS_BY_CODE[buf[i]].value})")
 
-        hold_id = f"H-{uuid.uuid4().hex[:10]}"
+        hold_id = self.store.ids.hold_id()
+        while hold_id in self.store.holds:  # e.g. an older uuid-based id
+            hold_id = self.store.ids.hold_id()
         minutes = hold_minutes if hold_minutes is not None else self.hold_minutes_default
         expires = self._now() + timedelta(minutes=minutes)
 
         # apply hold
-        for seat in requested:
-            flight.seat_map[seat] = SeatStatus.HOLD
+        for i in requested_idx:
+            buf[i] = SEAT_HOLD
 
         hold = Hold(
             id=hold_id,
@@ -355,15 +493,18 @@ class AirlineService:
             customer=customer,
             time_expires=expires,
             hold_status=HoldStatus.ACTIVE,
+            seat_idx=requested_idx,
         )
         self.store.holds[hold.id] = hold
+        heapq.heappush(self.store.active_hold_heap, (expires, hold.id))
         return hold
 
     def purchase_hold(self, hold_id: str) -> Purchase:
         """
         Stub payment: assumes payment ok.
-        Converts hold -> purchase, flips seat_map HOLD -> PURCHASED.
+        Converts hold -> purchase, flips seat_status HOLD -> PURCHASED.
         """
+        # always sweep: a hold that expired since the last sweep must not be sold
         self.sweep_expired_holds()
 
         if hold_id not in self.store.holds:
@@ -377,19 +518,21 @@ class AirlineService:
         if hold.hold_status != HoldStatus.ACTIVE:
             raise ValueError(f"Hold not ACTIVE (status={hold.hold_status.value})")
 
-        flight = self._get_flight(hold.flight_id)
+        buf = self._get_flight(hold.flight_id).seat_status
 
         # defensive check seats are still HOLD
-        for seat in hold.seats:
-            if flight.seat_map.get(seat) != SeatStatus.HOLD:
-                raise ValueError(f"Seat state mismatch for {seat}. Expected HOLD.")
+        for i in hold.seat_idx:
+            if buf[i] != SEAT_HOLD:
+                raise ValueError(f"Seat state mismatch for {idx_to_seat(i)}. Expected HOLD.")
 
-        purchase_id = f"P-{uuid.uuid4().hex[:10]}"
+        purchase_id = self.store.ids.purchase_id()
+        while purchase_id in self.store.purchases:
+            purchase_id = self.store.ids.purchase_id()
         now = self._now()
 
         # flip seats
-        for seat in hold.seats:
-            flight.seat_map[seat] = SeatStatus.PURCHASED
+        for i in hold.seat_idx:
+            buf[i] = SEAT_PURCHASED
 
         hold.hold_status = HoldStatus.CONVERTED
 
@@ -400,6 +543,7 @@ class AirlineService:
             customer=hold.customer,
             time_purchased=now,
             purchased_status=PurchaseStatus.ACTIVE,
+            seat_idx=list(hold.seat_idx),
         )
         self.store.purchases[purchase.id] = purchase
         return purchase
@@ -408,7 +552,7 @@ class AirlineService:
         """
         Cancels an ACTIVE purchase and returns seats to AVAILABLE.
         """
-        self.sweep_expired_holds()
+        self._maybe_sweep()
 
         if purchase_id not in self.store.purchases:
             raise ValueError(f"Unknown purchase_id: {purchase_id}")
@@ -422,9 +566,9 @@ class AirlineService:
         flight = self._get_flight(purchase.flight_id)
 
         # flip seats back
-        for seat in purchase.seats:
+        for i in purchase.seat_idx:
             # If seat isn't PURCHASED, something drifted; still make best effort.
-            flight.seat_map[seat] = SeatStatus.AVAILABLE
+            release_seat(flight, i)
 
         purchase.purchased_status = PurchaseStatus.CANCELLED
         return purchase
@@ -459,10 +603,9 @@ def cmd_search(args: argparse.Namespace, svc: AirlineService) -> int:
 
 
 def cmd_seats(args: argparse.Namespace, svc: AirlineService) -> int:
-    seat_map = svc.view_available_seats(args.flight_id)
-    rows = infer_rows_from_seat_map(seat_map)
+    seat_status = svc.view_available_seats(args.flight_id)
     print(f"Flight: {args.flight_id}")
-    print(format_seat_grid(seat_map, rows=rows))
+    print(format_seat_grid(seat_status))
     return 0
 
 
@@ -554,7 +697,7 @@ def cmd_admin_add_flight(args: argparse.Namespace, svc: AirlineService) -> int:
     print(f"route={flight.departure_airport}->{flight.arrival_airport}")
     print(f"depart={flight.departure_time}")
     print(f"arrive={flight.arrival_time}")
-    print(f"rows={infer_rows_from_seat_map(flight.seat_map)}")
+    print(f"rows={len(flight.seat_status) // SEATS_PER_ROW}")
     return 0
 
 
@@ -571,6 +714,14 @@ def build_parser() -> argparse.ArgumentParser:
         default="airline_state.json",
         help="Path to persisted state JSON (default: airline_state.json)",
     )
+    parser.add_argument(
+        "--pretty-state",
+        action="store_true",
+        help=(
+            "Write the state JSON indented (debug aid; default is compact). "
+            "Only affects commands that save: hold, purchase, cancel, admin-add-flight"
+        ),
+    )
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     p_search = sub.add_parser("search", help="Search flights")
@@ -579,11 +730,11 @@ def build_parser() -> argparse.ArgumentParser:
     p_search.add_argument("--departure-time", default=None, help='substring match against "YYYYMMDD HH:MM:SS"')
     p_search.add_argument("--arrival-time", default=None, help='substring match against "YYYYMMDD HH:MM:SS"')
     p_search.add_argument("--departure-date", default=None, help='Exact match "YYYY-MM-DD"')
-    p_search.set_defaults(func=cmd_search)
+    p_search.set_defaults(func=cmd_search, readonly=True)
 
     p_seats = sub.add_parser("seats", help="View seat map for a flight")
     p_seats.add_argument("flight_id")
-    p_seats.set_defaults(func=cmd_seats)
+    p_seats.set_defaults(func=cmd_seats, readonly=True)
 
     p_hold = sub.add_parser("hold", help="Reserve seats (create a hold)")
     p_hold.add_argument("flight_id")
@@ -591,18 +742,18 @@ def build_parser() -> argparse.ArgumentParser:
     p_hold.add_argument("--seats", default=None, help="Comma-separated seats, e.g. 12A,12B")
     p_hold.add_argument("--count", type=int, default=None, help="Auto-assign first N available seats")
     p_hold.add_argument("--hold-minutes", type=int, default=None, help="Override default hold TTL")
-    p_hold.set_defaults(func=cmd_hold)
+    p_hold.set_defaults(func=cmd_hold, readonly=False)
 
     p_purchase = sub.add_parser("purchase", help="Purchase a hold (payment stubbed)")
     p_purchase.add_argument("hold_id")
-    p_purchase.set_defaults(func=cmd_purchase)
+    p_purchase.set_defaults(func=cmd_purchase, readonly=False)
 
     p_cancel = sub.add_parser("cancel", help="Cancel a purchase")
     p_cancel.add_argument("purchase_id")
-    p_cancel.set_defaults(func=cmd_cancel)
+    p_cancel.set_defaults(func=cmd_cancel, readonly=False)
 
     p_debug = sub.add_parser("debug", help="Print holds/purchases (dev helper)")
-    p_debug.set_defaults(func=cmd_debug)
+    p_debug.set_defaults(func=cmd_debug, readonly=True)
 
     p_admin_add = sub.add_parser("admin-add-flight", help="Admin: add a flight")
     p_admin_add.add_argument("--departure-city", required=True)
@@ -621,10 +772,10 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_admin_add.add_argument("--rows", type=int, default=24, help="Number of seat rows (A-F layout)")
     p_admin_add.add_argument("--flight-id", default=None, help="Optional explicit flight_id")
-    p_admin_add.set_defaults(func=cmd_admin_add_flight)
+    p_admin_add.set_defaults(func=cmd_admin_add_flight, readonly=False)
 
     p_admin_list = sub.add_parser("admin-list-flights", help="Admin: list all flights")
-    p_admin_list.set_defaults(func=cmd_admin_list_flights)
+    p_admin_list.set_defaults(func=cmd_admin_list_flights, readonly=True)
 
     return parser
 
@@ -637,6 +788,35 @@ def _holdstatus_from_str(s: str) -> HoldStatus:
 def _purchasestatus_from_str(s: str) -> PurchaseStatus:
     return PurchaseStatus(s)
 
+def _seat_status_from_dict(f: dict) -> bytearray:
+    if "seat_status_b64" in f:
+        return bytearray(base64.b64decode(f["seat_status_b64"]))
+    # older state files stored a {"12A": "AVAILABLE", ...} seat_map
+    seat_map = f["seat_map"]
+    buf = build_seat_map(rows=infer_rows_from_seat_map(seat_map), seats_per_row=SEATS_PER_ROW)
+    for seat, st in seat_map.items():
+        try:
+            i = seat_to_idx(seat)
+        except ValueError:
+            continue  # not a seat on the A-F grid; nothing can address it
+        buf[i] = _SEAT_CODE_BY_STATUS[_seatstatus_from_str(st)]
+    return buf
+
+def _seat_idx_from_labels(store: InMemoryStore, flight_id: str, seats: List[str]) -> List[int]:
+    # hand-edited or legacy state may carry labels that name no seat on the
+    # plane; drop them rather than fail the load
+    flight = store.flights.get(flight_id)
+    n_seats = len(flight.seat_status) if flight else 0
+    out: List[int] = []
+    for seat in seats:
+        try:
+            i = seat_to_idx(seat)
+        except ValueError:
+            continue
+        if i < n_seats:
+            out.append(i)
+    return out
+
 def store_to_dict(store: InMemoryStore) -> dict:
     return {
         "flights": {
@@ -649,7 +829,7 @@ def store_to_dict(store: InMemoryStore) -> dict:
                 "departure_time": f.departure_time,
                 "arrival_time": f.arrival_time,
                 "departure_date": f.departure_date,
-                "seat_map": {k: v.value for k, v in f.seat_map.items()},
+                "seat_status_b64": base64.b64encode(bytes(f.seat_status)).decode("ascii"),
             }
             for fid, f in store.flights.items()
         },
@@ -657,7 +837,7 @@ def store_to_dict(store: InMemoryStore) -> dict:
             hid: {
                 "id": h.id,
                 "flight_id": h.flight_id,
-                "seats": list(h.seats),
+                "seats": h.seats,
                 "customer": h.customer,
                 "time_expires": h.time_expires.isoformat(),
                 "hold_status": h.hold_status.value,
@@ -668,7 +848,7 @@ def store_to_dict(store: InMemoryStore) -> dict:
             pid: {
                 "id": p.id,
                 "flight_id": p.flight_id,
-                "seats": list(p.seats),
+                "seats": p.seats,
                 "customer": p.customer,
                 "time_purchased": p.time_purchased.isoformat(),
                 "purchased_status": p.purchased_status.value,
@@ -680,8 +860,8 @@ def store_to_dict(store: InMemoryStore) -> dict:
 def dict_to_store(data: dict) -> InMemoryStore:
     store = InMemoryStore()
     # flights
-    for fid, f in data.get("flights", {}).items():
-        store.flights[fid] = Flight(
+    store.load_flights(
+        Flight(
             id=f["id"],
             departure_city=f["departure_city"],
             arrival_city=f["arrival_city"],
@@ -690,8 +870,10 @@ def dict_to_store(data: dict) -> InMemoryStore:
             departure_time=f["departure_time"],
             arrival_time=f["arrival_time"],
             departure_date=f["departure_date"],
-            seat_map={k: _seatstatus_from_str(v) for k, v in f["seat_map"].items()},
+            seat_status=_seat_status_from_dict(f),
         )
+        for f in data.get("flights", {}).values()
+    )
     # holds
     for hid, h in data.get("holds", {}).items():
         store.holds[hid] = Hold(
@@ -701,7 +883,12 @@ def dict_to_store(data: dict) -> InMemoryStore:
             customer=h["customer"],
             time_expires=datetime.fromisoformat(h["time_expires"]),
             hold_status=_holdstatus_from_str(h["hold_status"]),
+            seat_idx=_seat_idx_from_labels(store, h["flight_id"], h["seats"]),
         )
+    store.active_hold_heap = [
+        (h.time_expires, h.id) for h in store.holds.values() if h.hold_status == HoldStatus.ACTIVE
+    ]
+    heapq.heapify(store.active_hold_heap)
     # purchases
     for pid, p in data.get("purchases", {}).items():
         store.purchases[pid] = Purchase(
@@ -711,7 +898,9 @@ def dict_to_store(data: dict) -> InMemoryStore:
             customer=p["customer"],
             time_purchased=datetime.fromisoformat(p["time_purchased"]),
             purchased_status=_purchasestatus_from_str(p["purchased_status"]),
+            seat_idx=_seat_idx_from_labels(store, p["flight_id"], p["seats"]),
         )
+    store.ids = IdGen(hold_seq=len(store.holds), purchase_seq=len(store.purchases))
     return store
 
 def load_store(path: str) -> InMemoryStore:
@@ -725,10 +914,13 @@ def load_store(path: str) -> InMemoryStore:
     store.seed_flights()
     return store
 
-def save_store(store: InMemoryStore, path: str) -> None:
+def save_store(store: InMemoryStore, path: str, pretty: bool = False) -> None:
     tmp = f"{path}.tmp"
     with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(store_to_dict(store), f, indent=2, sort_keys=True)
+        if pretty:
+            json.dump(store_to_dict(store), f, indent=2, sort_keys=True)
+        else:
+            json.dump(store_to_dict(store), f, separators=(",", ":"), sort_keys=True)
     os.replace(tmp, path)
 
 
@@ -742,8 +934,10 @@ def main(argv: List[str]) -> int:
 
     try:
         rc = args.func(args, svc)
-        # save state after successful command
-        save_store(store, args.state_file)
+        # save state after successful command; read-only commands may still
+        # sweep expired holds in memory, but the next write repeats the sweep
+        if not args.readonly:
+            save_store(store, args.state_file, pretty=args.pretty_state)
         return rc
     except ValueError as e:
         print(f"ERROR: {e}", file=sys.stderr)
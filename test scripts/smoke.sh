@@ -63,6 +63,18 @@ run_cli() {
   python3 "$ROOT_DIR/airline.py" --state-file "$STATE_FILE" "$@"
 }
 
+persisted_seat_status() {
+  local flight_id="$1"
+  local seat="$2"
+  python3 - "$ROOT_DIR" "$STATE_FILE" "$flight_id" "$seat" <<'EOF'
+import sys
+sys.path.insert(0, sys.argv[1])
+import airline
+store = airline.load_store(sys.argv[2])
+print(airline.get_seat_status(store.flights[sys.argv[3]], sys.argv[4]).value)
+EOF
+}
+
 print_state_snapshot() {
   local label="$1"
   if [[ "$PRINT_STATE" != "1" ]]; then
@@ -147,7 +159,7 @@ run_test_4() {
 run_test_5() {
   echo "[smoke] 5/12 verify seat moved to PURCHASED in persisted state"
   ensure_purchase_id
-  contains_file '"12C": "PURCHASED"' "$STATE_FILE"
+  [[ "$(persisted_seat_status "$SEED_FLIGHT_ID" 12C)" == "PURCHASED" ]]
 }
 
 run_test_6() {
@@ -159,10 +171,10 @@ run_test_6() {
 
 run_test_7() {
   echo "[smoke] 7/12 verify seat returned to AVAILABLE in persisted state"
-  if contains_file '"12C": "PURCHASED"' "$STATE_FILE"; then
+  if [[ "$(persisted_seat_status "$SEED_FLIGHT_ID" 12C)" == "PURCHASED" ]]; then
     run_test_6 >/dev/null
   fi
-  contains_file '"12C": "AVAILABLE"' "$STATE_FILE"
+  [[ "$(persisted_seat_status "$SEED_FLIGHT_ID" 12C)" == "AVAILABLE" ]]
 }
 
 run_test_8() {